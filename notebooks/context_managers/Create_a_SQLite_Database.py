@@ -2,51 +2,25 @@
  "cells": [
   {
    "cell_type": "code",
-   "execution_count": 1,
+   "execution_count": null,
    "metadata": {},
    "outputs": [],
    "source": [
-    "import sqlite3\n",
-    "import pandas as pd\n",
-    "from pandas import DataFrame\n",
-    "\n",
-    "conn = sqlite3.connect('../SQLDatabase.db')  \n",
-    "c = conn.cursor()"
-   ]
-  },
-  {
-   "cell_type": "code",
-   "execution_count": 2,
-   "metadata": {},
-   "outputs": [
-    {
-     "data": {
-      "text/plain": [
-       "<sqlite3.Cursor at 0x7fe178db9e30>"
-      ]
-     },
-     "execution_count": 2,
-     "metadata": {},
-     "output_type": "execute_result"
-    }
-   ],
-   "source": [
-    "# Create empty table with the column names corresponding to csv\n",
-    "\n",
-    "c.execute('''CREATE TABLE IF NOT EXISTS programming_trends (Month int, Python int, SQL int, R int, JavaScript int,\n",
-    "       Visual_Basic_for_Applications int)''')"
+    "from programming_trends_db import bulk_loading, create_table, load_csv"
    ]
   },
   {
    "cell_type": "code",
-   "execution_count": 3,
+   "execution_count": null,
    "metadata": {},
    "outputs": [],
    "source": [
-    "# read data with pandas and push to SQL \n",
+    "# Create the table keyed on Month (an older table with duplicated months is migrated)\n",
+    "# and upsert the csv in a single transaction, rerunning this does not duplicate rows\n",
     "\n",
-    "read_clients = pd.read_csv (r'../data/programming-trends.csv')\n",
-    "read_clients.to_sql('programming_trends', conn, if_exists='append', index = False)"
+    "with bulk_loading('SQLDatabase.db') as conn:\n",
+    "    create_table(conn)\n",
+    "    load_csv(conn, 'data/programming-trends.csv')"
    ]
   }
  ],
@@ -0,0 +1,91 @@
+"""Time loading synthetic programming trends with `to_sql` and with the upsert loader
+
+    python programming_trends_benchmark.py --rows 1000000
+"""
+import argparse
+import datetime
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+import programming_trends_db as db
+
+OLD_CREATE_TABLE = '''CREATE TABLE IF NOT EXISTS programming_trends (Month int, Python int, SQL int,
+    R int, JavaScript int, Visual_Basic_for_Applications int)'''
+
+RANGE_QUERY = "SELECT * FROM programming_trends WHERE Month >= '2004-01-01' AND Month < '2015-01-01'"
+
+
+def synthetic_rows(rows, seed=42):
+    """One row per hour up to the end of 2014, so every Month key is unique and sortable
+
+    Ending in 2014 means the range query always has rows to return.
+    """
+    rng = random.Random(seed)
+    first = datetime.datetime(2014, 12, 31, 23) - datetime.timedelta(hours=rows - 1)
+    for hour in range(rows):
+        month = (first + datetime.timedelta(hours=hour)).isoformat(sep=' ', timespec='minutes')
+        yield [month] + [rng.randint(0, 100) for _ in db.COLUMNS[1:]]
+
+
+def timed(description, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    print(f'{description:<32} {time.perf_counter() - start:>8.2f}s')
+    return result
+
+
+def load_with_to_sql(path, df):
+    with sqlite3.connect(path) as conn:
+        conn.execute(OLD_CREATE_TABLE)
+        df.to_sql('programming_trends', conn, if_exists='append', index=False)
+    conn.close()
+
+
+def load_with_upsert(path, rows):
+    with db.bulk_loading(path) as conn:
+        db.create_table(conn)
+        db.upsert_rows(conn, rows)
+
+
+def range_query(path):
+    with sqlite3.connect(path) as conn:
+        result = conn.execute(RANGE_QUERY).fetchall()
+    conn.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rows = list(synthetic_rows(args.rows))
+    df = pd.DataFrame(rows, columns=db.COLUMNS)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_db, new_db = Path(tmp) / 'to_sql.db', Path(tmp) / 'upsert.db'
+
+        timed('to_sql append', load_with_to_sql, old_db, df)
+        timed('to_sql append (rerun)', load_with_to_sql, old_db, df)
+        timed('upsert loader', load_with_upsert, new_db, rows)
+        timed('upsert loader (rerun)', load_with_upsert, new_db, rows)
+
+        old_result = timed('range query, no key', range_query, old_db)
+        new_result = timed('range query, primary key', range_query, new_db)
+        assert old_result and sorted(set(old_result)) == sorted(new_result)
+
+        for path in (old_db, new_db):
+            with sqlite3.connect(path) as conn:
+                count, = conn.execute('SELECT count(*) FROM programming_trends').fetchone()
+            conn.close()
+            print(f'{path.name:<12} {count:>10,} rows')
+        print(f'Range query returned {len(old_result):,} and {len(new_result):,} rows')
+
+
+if __name__ == '__main__':
+    main()
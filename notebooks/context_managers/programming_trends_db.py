@@ -0,0 +1,75 @@
+import contextlib
+import csv
+import sqlite3
+
+COLUMNS = ['Month', 'Python', 'SQL', 'R', 'JavaScript', 'Visual_Basic_for_Applications']
+
+# WITHOUT ROWID stores the rows ordered by Month, so a range of months is read as one
+# contiguous slice of the primary key instead of an index lookup per row.
+CREATE_TABLE = '''CREATE TABLE IF NOT EXISTS programming_trends (
+    Month TEXT PRIMARY KEY, Python int, SQL int, R int, JavaScript int,
+    Visual_Basic_for_Applications int
+) WITHOUT ROWID'''
+
+UPSERT = f'''INSERT INTO programming_trends ({', '.join(COLUMNS)})
+VALUES ({', '.join('?' for _ in COLUMNS)})
+ON CONFLICT(Month) DO UPDATE SET
+    {', '.join(f'{col} = excluded.{col}' for col in COLUMNS[1:])}'''
+
+
+@contextlib.contextmanager
+def bulk_loading(path):
+    """Open the database with settings tuned for bulk loading, and close it afterwards
+
+    WAL is only used while loading. The journal mode is stored in the database file,
+    so it is switched back before closing and readers do not need `-wal`/`-shm` files.
+    """
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+        conn.execute('PRAGMA temp_store = MEMORY')
+        yield conn
+    finally:
+        conn.rollback()
+        conn.execute('PRAGMA journal_mode = DELETE')
+        conn.close()
+
+
+def create_table(conn):
+    """Create `programming_trends` keyed on Month
+
+    A table from an earlier version of this script, without a primary key and possibly
+    with duplicated months, is migrated into the new table.
+    """
+    columns = conn.execute('PRAGMA table_info(programming_trends)').fetchall()
+    has_primary_key = any(pk for *_, pk in columns)
+
+    with conn:
+        if not conn.in_transaction:
+            conn.execute('BEGIN')
+        if columns and not has_primary_key:
+            conn.execute('ALTER TABLE programming_trends RENAME TO programming_trends_old')
+            conn.execute(CREATE_TABLE)
+            conn.execute(f'''INSERT OR REPLACE INTO programming_trends
+                             SELECT {', '.join(COLUMNS)} FROM programming_trends_old''')
+            conn.execute('DROP TABLE programming_trends_old')
+        else:
+            conn.execute(CREATE_TABLE)
+
+
+def upsert_rows(conn, rows):
+    """Insert or update an iterable of rows, in `COLUMNS` order, in a single transaction"""
+    with conn:
+        cursor = conn.executemany(UPSERT, rows)
+    return cursor.rowcount
+
+
+def load_csv(conn, path):
+    """Upsert a programming trends CSV, streaming it straight into `executemany`"""
+    with open(path, newline='') as file:
+        reader = csv.reader(file)
+        header = next(reader)
+        if header != COLUMNS:
+            raise ValueError(f'Expected columns {COLUMNS}, got {header}')
+        return upsert_rows(conn, reader)
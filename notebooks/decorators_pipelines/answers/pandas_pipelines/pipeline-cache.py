@@ -0,0 +1,19 @@
+from pipeline_cache import CachedPipeline, StageCache
+
+# The stages are the ones from answers/pandas_pipelines/pipeline.py
+
+pipeline = CachedPipeline(
+    [rename_columns, parse_dates, set_date_as_index, filter_date, resample, get_rolling],
+    cache=StageCache(max_entries=12),
+)
+
+pipeline.run(sanfran)
+
+# Changing the window only reruns `get_rolling`, the dates are not parsed again
+(
+    pipeline
+    .run(sanfran, get_rolling={'window': 20})
+    .plot(figsize=(9,5), title='Crime Count in San Fransisco')
+)
+
+pipeline.last_run
@@ -0,0 +1,46 @@
+from pipeline_metrics import instrument, recorder
+
+@instrument
+def rename_cols(df, renamer = str.lower, remove_s = ('dates',)):
+    return (
+        df
+        .rename(columns=renamer)
+        .rename(columns = {col: col[:-1] for col in remove_s})
+    )
+
+@instrument
+def parse_date_types(df, date_cols = ('date',)):
+    return (
+        df
+        .assign(**{col: lambda df: pd.to_datetime(df[col]) for col in date_cols})
+    )
+
+@instrument
+def set_date_as_index(df, date_col='date'):
+    return df.set_index(date_col).sort_index()
+
+@instrument
+def filter_date(df, start='2004', end='2014'):
+    return df.loc[start:end]
+
+@instrument
+def resample(df, sample='ME', value='category', agg='count'):
+    return df.resample(sample)[[value]].agg(agg)
+
+@instrument
+def get_rolling(df, window=10, col='category', agg='mean'):
+    return df.assign(**{f'col_rolling': lambda df: df[col].rolling(window).agg(agg)})
+
+# Nothing is measured (or printed) outside of `recorder.recording()`
+with recorder.recording():
+    crime_counts = (
+        sanfran
+        .pipe(rename_cols)
+        .pipe(parse_date_types)
+        .pipe(set_date_as_index)
+        .pipe(filter_date)
+        .pipe(resample)
+        .pipe(get_rolling)
+    )
+
+recorder.report()
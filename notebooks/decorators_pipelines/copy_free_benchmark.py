@@ -0,0 +1,106 @@
+"""Compare peak memory of the crime count pipeline with and without the copy-free mode
+
+    python copy_free_benchmark.py --rows 5000000
+
+Each mode runs in a fresh process, so the max RSS of one run does not leak into the other.
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from copy_free_pipeline import crime_counts
+
+SAMPLE = Path(__file__).parent / 'data' / 'san_fran_crime_sample.csv'
+
+
+def make_scaled_csv(path, rows, seed=42):
+    """Resample the crime sample up to `rows` rows, shifting dates within the day"""
+    rng = np.random.default_rng(seed)
+    scaled = pd.read_csv(SAMPLE).sample(rows, replace=True, random_state=seed)
+    dates = pd.to_datetime(scaled['Dates']) + pd.to_timedelta(rng.integers(0, 86_400, rows), unit='s')
+    scaled.assign(Dates=dates.dt.strftime('%Y-%m-%d %H:%M:%S')).to_csv(path, index=False)
+
+
+def eager_crime_counts(df):
+    """The stages of answers/pandas_pipelines/pipeline.py, without copy-on-write on pandas < 3"""
+    return (
+        df
+        .rename(columns=str.lower)
+        .rename(columns={'dates': 'date'})
+        .assign(date=lambda df: pd.to_datetime(df['date']))
+        .set_index('date')
+        .sort_index()
+        .loc['2004':'2014']
+        .resample('ME')[['category']]
+        .agg('count')
+        .assign(rolling=lambda df: df['category'].rolling(10).agg('mean'))
+    )
+
+
+MODES = {'eager': eager_crime_counts, 'copy-free': crime_counts}
+
+
+def run_mode(mode, csv_path, result_path):
+    df = pd.read_csv(csv_path)
+    rss_after_load = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = MODES[mode](df)
+    seconds = time.perf_counter() - start
+    _, pipeline_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result.to_pickle(result_path)
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    unit = 1 if sys.platform == 'darwin' else 1024
+    print(json.dumps({
+        'mode': mode,
+        'seconds': round(seconds, 3),
+        'pipeline_peak_mb': round(pipeline_peak / 2**20, 1),
+        'rss_after_load_mb': round(rss_after_load * unit / 2**20, 1),
+        'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit / 2**20, 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--run', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--csv', help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_mode(args.run, args.csv, args.result)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / 'san_fran_crime_scaled.csv'
+        make_scaled_csv(csv_path, args.rows)
+        print(f'{args.rows:,} rows, {csv_path.stat().st_size / 2**20:.0f} MB of CSV')
+
+        results = {}
+        for mode in MODES:
+            result_path = Path(tmp) / f'{mode}.pkl'
+            subprocess.run(
+                [sys.executable, __file__, '--run', mode, '--csv', str(csv_path), '--result', str(result_path)],
+                check=True,
+            )
+            results[mode] = pd.read_pickle(result_path)
+
+        pd.testing.assert_frame_equal(results['eager'], results['copy-free'], check_freq=False)
+        print('Results are identical')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+import contextlib
+
+import numpy as np
+import pandas as pd
+
+
+@contextlib.contextmanager
+def copy_on_write():
+    """Turn on copy-on-write, which is always on from pandas 3.0
+
+    With copy-on-write `rename`, `assign` and `set_index` share the column buffers
+    of their input instead of copying the whole frame.
+    """
+    if int(pd.__version__.split('.')[0]) >= 3:
+        yield
+    else:
+        with pd.option_context('mode.copy_on_write', True):
+            yield
+
+
+def rename_columns(df, func=str.lower, renames={'dates': 'date'}):
+    """Both renames from pipeline.py in a single pass"""
+    return df.rename(columns=lambda col: renames.get(func(col), func(col)))
+
+
+def parse_dates(df, date_col='date'):
+    return df.assign(date=lambda df: pd.to_datetime(df[date_col]))
+
+
+def index_by_date(df, start='2004', end='2014', date_col='date'):
+    """`set_index(date_col).sort_index().loc[start:end]` with a single copy of the rows
+
+    The filter and the sort order are computed on the date column alone, and the kept
+    rows are gathered once. Dates that are already in order are sliced without a copy.
+    Partial dates like '2014' include the whole period, like partial string indexing.
+    """
+    dates = df[date_col].to_numpy()
+    lower = pd.Period(start).start_time.to_datetime64()
+    upper = (pd.Period(end) + 1).start_time.to_datetime64()
+
+    if df[date_col].is_monotonic_increasing:
+        first, last = np.searchsorted(dates, [lower, upper])
+        return df.iloc[first:last].set_index(date_col)
+
+    keep = np.flatnonzero((dates >= lower) & (dates < upper))
+    order = keep[np.argsort(dates[keep], kind='stable')]
+    return df.take(order).set_index(date_col)
+
+
+def resample(df, sample_by='ME', col='category', agg_func='count'):
+    return df.resample(sample_by)[[col]].agg(agg_func)
+
+
+def get_rolling(df, window=10, col='category', agg_func='mean'):
+    return df.assign(rolling=lambda df: df[col].rolling(window).agg(agg_func))
+
+
+def crime_counts(df, start='2004', end='2014', sample_by='ME', window=10, col='category'):
+    """The crime count pipeline, only carrying the columns it needs past the renames"""
+    with copy_on_write():
+        return (
+            df
+            .pipe(rename_columns)
+            .loc[:, ['date', col]]
+            .pipe(parse_dates)
+            .pipe(index_by_date, start=start, end=end)
+            .pipe(resample, sample_by=sample_by, col=col)
+            .pipe(get_rolling, window=window, col=col)
+        )
@@ -0,0 +1,191 @@
+import hashlib
+import inspect
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+
+def fingerprint_frame(df):
+    """Hash the values, index, column names and dtypes of a dataframe"""
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    digest.update(repr([(col, str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+    return digest.hexdigest()
+
+
+def fingerprint_code(code):
+    """Hash a code object and the code objects nested in it (e.g. lambdas)
+
+    The `repr` of a nested code object contains its memory address, so it is hashed
+    from its bytecode, constants and names instead to give the same key in every process.
+    """
+    digest = hashlib.sha256()
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        digest.update(_fingerprint_const(const).encode())
+    return digest.hexdigest()
+
+
+def _fingerprint_const(const):
+    """Hash a constant the same way in every process
+
+    `x in {'a', 'b'}` compiles to a frozenset, whose `repr` order depends on PYTHONHASHSEED.
+    """
+    if inspect.iscode(const):
+        return fingerprint_code(const)
+    if isinstance(const, frozenset):
+        return repr(sorted(_fingerprint_const(item) for item in const))
+    if isinstance(const, tuple):
+        return repr([_fingerprint_const(item) for item in const])
+    return repr(const)
+
+
+def fingerprint_stage(parent_key, func, kwargs):
+    """Chain the key of the previous stage with the code and parameters of a stage
+
+    Default arguments are filled in, so `get_rolling` and `get_rolling(window=10)`
+    share a key. Parameters are compared by `repr`, so lambdas will never hit the cache.
+    """
+    bound = inspect.signature(func).bind_partial(None, **kwargs)
+    bound.apply_defaults()
+    params = list(bound.arguments.items())[1:]
+
+    # Decorators like `@instrument` share one wrapper, the stage body is the wrapped function
+    code = getattr(inspect.unwrap(func), '__code__', None)
+    body = fingerprint_code(code).encode() if code else b''
+
+    digest = hashlib.sha256()
+    digest.update(parent_key.encode())
+    digest.update(func.__qualname__.encode())
+    digest.update(body)
+    digest.update(repr(params).encode())
+    return digest.hexdigest()
+
+
+class StageCache:
+    """LRU cache of intermediate dataframes, optionally backed by a directory
+
+    `get` and `lookup` hand out shallow copies, so callers changing a frame (e.g. adding a
+    column) do not change the cached one. Under copy-on-write this does not copy any data.
+    """
+
+    def __init__(self, max_entries=8, directory=None):
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory is not None else None
+        self.hits = 0
+        self.misses = 0
+        self._frames = OrderedDict()
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key):
+        return self.directory / f'{key}.pkl'
+
+    def get(self, key):
+        df = self.lookup(key)
+        if df is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return df
+
+    def lookup(self, key):
+        """Like `get`, but without counting a hit or miss"""
+        df = self._lookup(key)
+        return None if df is None else df.copy(deep=False)
+
+    def _lookup(self, key):
+        if key in self._frames:
+            self._frames.move_to_end(key)
+            return self._frames[key]
+
+        if self.directory is not None and self._path(key).exists():
+            os.utime(self._path(key))
+            df = pd.read_pickle(self._path(key))
+            self._remember(key, df)
+            return df
+
+        return None
+
+    def put(self, key, df):
+        self._remember(key, df)
+        if self.directory is not None:
+            df.to_pickle(self._path(key))
+            self._evict_from_disk()
+
+    def clear(self):
+        self._frames.clear()
+        if self.directory is not None:
+            for path in self.directory.glob('*.pkl'):
+                path.unlink()
+
+    def _remember(self, key, df):
+        self._frames[key] = df
+        self._frames.move_to_end(key)
+        while len(self._frames) > self.max_entries:
+            self._frames.popitem(last=False)
+
+    def _evict_from_disk(self):
+        paths = sorted(self.directory.glob('*.pkl'), key=lambda path: path.stat().st_mtime)
+        for path in paths[:-self.max_entries]:
+            path.unlink()
+
+
+class CachedPipeline:
+    """Run a chain of `.pipe` stages, resuming from the deepest cached stage
+
+    Stages are functions or `(function, kwargs)` tuples, exactly as they would be
+    passed to `.pipe()`.
+    """
+
+    def __init__(self, stages, cache=None):
+        self.stages = [stage if isinstance(stage, tuple) else (stage, {}) for stage in stages]
+        self.cache = cache if cache is not None else StageCache()
+        self.last_run = None
+
+    def run(self, df, key=None, **params):
+        """Run all stages on `df`
+
+        - `key` replaces hashing the input (e.g. a file name and modification time).
+        - Keyword arguments override stage parameters by stage name,
+          e.g. `run(df, get_rolling={'window': 20})`.
+
+        Every run counts as one hit (it resumed from a cached stage) or one miss. The
+        result is a shallow copy, so changing it leaves the cached stage output untouched.
+        """
+        unknown = set(params) - {func.__name__ for func, _ in self.stages}
+        if unknown:
+            raise ValueError(f'No stages named {sorted(unknown)} in this pipeline')
+
+        stages = [(func, {**kwargs, **params.get(func.__name__, {})}) for func, kwargs in self.stages]
+
+        keys = []
+        parent = key if key is not None else fingerprint_frame(df)
+        for func, kwargs in stages:
+            parent = fingerprint_stage(parent, func, kwargs)
+            keys.append(parent)
+
+        start, result = 0, df
+        for i in reversed(range(len(keys))):
+            cached = self.cache.lookup(keys[i])
+            if cached is not None:
+                start, result = i + 1, cached
+                break
+
+        if start:
+            self.cache.hits += 1
+        else:
+            self.cache.misses += 1
+
+        for (func, kwargs), stage_key in zip(stages[start:], keys[start:]):
+            result = result.pipe(func, **kwargs)
+            self.cache.put(stage_key, result)
+
+        self.last_run = {
+            'reused': [func.__name__ for func, _ in stages[:start]],
+            'computed': [func.__name__ for func, _ in stages[start:]],
+        }
+        return result.copy(deep=False)
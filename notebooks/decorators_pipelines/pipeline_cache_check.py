@@ -0,0 +1,144 @@
+"""Check that the stage cache is reused when it should be, and only then
+
+    python pipeline_cache_check.py
+
+- The first process runs the crime pipeline with a cache directory, the second one
+  changes the rolling window and must resume from `resample`.
+- Changing a returned frame must not change the cached stage output.
+- Editing the body of an `@instrument`-ed stage must recompute it.
+- Stage keys must not depend on PYTHONHASHSEED.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from pipeline_cache import CachedPipeline, StageCache, fingerprint_stage
+from pipeline_metrics import instrument
+
+SAMPLE = Path(__file__).parent / 'data' / 'san_fran_crime_sample.csv'
+
+
+# The stages of answers/pandas_pipelines/pipeline.py
+
+def rename_columns(df, func = str.lower, renames = {'dates':'date'}):
+    return df.rename(columns=func).rename(columns = renames)
+
+def parse_dates(df, date_col = 'date'):
+    return df.assign(date = lambda df: pd.to_datetime(df[date_col]))
+
+def set_date_as_index(df, date_col='date'):
+    return df.set_index(date_col).sort_index()
+
+def filter_date(df, start='2004', end='2014'):
+    return df.loc[start:end]
+
+def resample(df, sample_by='ME', col='category', agg_func='count'):
+    return df.resample(sample_by)[[col]].agg(agg_func)
+
+def get_rolling(df, window=10, col='category', agg_func='mean'):
+    return df.assign(rolling = lambda df: df[col].rolling(window).agg(agg_func))
+
+
+def define_stage(source):
+    """Define a stage from source, like editing its body in a notebook cell"""
+    namespace = {'instrument': instrument, 'pd': pd}
+    exec(source, namespace)
+    return namespace['count_by_month']
+
+
+def check_results_are_copies():
+    pipeline = CachedPipeline([rename_columns, parse_dates])
+    df = pd.read_csv(SAMPLE)
+    result = pipeline.run(df)
+    result['category'] = 'CHANGED'
+    result = pipeline.run(df)
+    assert pipeline.last_run['computed'] == [], pipeline.last_run
+    assert (result['category'] != 'CHANGED').all()
+
+
+def check_instrumented_stage_edits():
+    before = define_stage(
+        "@instrument\n"
+        "def count_by_month(df):\n"
+        "    return df.resample('ME')[['category']].count()\n"
+    )
+    after = define_stage(
+        "@instrument\n"
+        "def count_by_month(df):\n"
+        "    return df.resample('ME')[['category']].nunique()\n"
+    )
+    cache = StageCache()
+    df = pd.read_csv(SAMPLE).pipe(rename_columns).pipe(parse_dates).pipe(set_date_as_index)
+    CachedPipeline([before], cache=cache).run(df)
+    pipeline = CachedPipeline([after], cache=cache)
+    pipeline.run(df)
+    assert pipeline.last_run['computed'] == ['count_by_month'], pipeline.last_run
+
+
+def keep_known_categories(df):
+    return df.loc[lambda df: df['category'].map(lambda c: c in {'ASSAULT', 'ARSON', 'FRAUD'})]
+
+
+def check_keys_ignore_hash_seed():
+    keys = {
+        subprocess.run(
+            [sys.executable, __file__, '--stage-key'],
+            check=True, capture_output=True, text=True, env={**os.environ, 'PYTHONHASHSEED': str(seed)},
+        ).stdout
+        for seed in range(3)
+    }
+    assert len(keys) == 1, keys
+
+
+def run(directory, window):
+    pipeline = CachedPipeline(
+        [rename_columns, parse_dates, set_date_as_index, filter_date, resample, get_rolling],
+        cache=StageCache(max_entries=12, directory=directory),
+    )
+    pipeline.run(pd.read_csv(SAMPLE), get_rolling={'window': window})
+    print(json.dumps(pipeline.last_run))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--directory', help=argparse.SUPPRESS)
+    parser.add_argument('--window', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--stage-key', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.directory:
+        run(args.directory, args.window)
+        return
+    if args.stage_key:
+        print(fingerprint_stage('', keep_known_categories, {}))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        runs = [
+            json.loads(subprocess.run(
+                [sys.executable, __file__, '--directory', tmp, '--window', str(window)],
+                check=True, capture_output=True, text=True,
+            ).stdout)
+            for window in (10, 20)
+        ]
+
+    assert runs[0]['reused'] == [], runs[0]
+    assert runs[1]['computed'] == ['get_rolling'], runs[1]
+    print('A fresh process resumed from `resample`')
+
+    check_results_are_copies()
+    print('Changing a result left the cached stage output untouched')
+    check_instrumented_stage_edits()
+    print('Editing an instrumented stage recomputed it')
+    check_keys_ignore_hash_seed()
+    print('Stage keys are the same for every PYTHONHASHSEED')
+
+
+if __name__ == '__main__':
+    main()
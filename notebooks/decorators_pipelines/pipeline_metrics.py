@@ -0,0 +1,150 @@
+import contextlib
+import functools
+import time
+from collections import deque, namedtuple
+
+import numpy as np
+import pandas as pd
+
+StageRecord = namedtuple(
+    'StageRecord',
+    ['stage', 'start_ns', 'duration_ns', 'rows_in', 'rows_out', 'memory_delta', 'copies'],
+)
+
+
+class StageRecorder:
+    """Keeps the last `maxlen` stage measurements in a ring buffer
+
+    Recording is off by default, so instrumented stages only pay for one attribute lookup.
+    """
+
+    def __init__(self, maxlen=1024, enabled=False):
+        self.enabled = enabled
+        self.records = deque(maxlen=maxlen)
+
+    @contextlib.contextmanager
+    def recording(self):
+        previous, self.enabled = self.enabled, True
+        try:
+            yield self
+        finally:
+            self.enabled = previous
+
+    def clear(self):
+        self.records.clear()
+
+    def to_frame(self):
+        """All buffered measurements, one row per stage call"""
+        return pd.DataFrame(list(self.records), columns=StageRecord._fields)
+
+    def report(self):
+        """Measurements aggregated per stage, in order of first call"""
+        return (
+            self.to_frame()
+            .groupby('stage', sort=False)
+            .agg(
+                calls=('duration_ns', 'size'),
+                total_ms=('duration_ns', 'sum'),
+                max_ms=('duration_ns', 'max'),
+                rows_in=('rows_in', 'sum'),
+                rows_out=('rows_out', 'sum'),
+                memory_delta_mb=('memory_delta', 'sum'),
+                copies=('copies', 'sum'),
+            )
+            .assign(
+                total_ms=lambda df: df['total_ms'] / 1e6,
+                max_ms=lambda df: df['max_ms'] / 1e6,
+                memory_delta_mb=lambda df: df['memory_delta_mb'] / 2**20,
+            )
+        )
+
+
+recorder = StageRecorder()
+
+
+def _rows(df):
+    return len(df) if isinstance(df, (pd.DataFrame, pd.Series)) else None
+
+
+def _memory(df):
+    if isinstance(df, pd.DataFrame):
+        return int(df.memory_usage(deep=True).sum())
+    if isinstance(df, pd.Series):
+        return int(df.memory_usage(deep=True))
+    return 0
+
+
+def _copies(before, after):
+    """Count the columns of `after` that do not reuse a buffer of `before`
+
+    Arrow-backed columns are converted by `np.asarray` and therefore always count as copies.
+    """
+    if not (isinstance(before, pd.DataFrame) and isinstance(after, pd.DataFrame)):
+        return None
+    buffers = [np.asarray(before.iloc[:, i].array) for i in range(before.shape[1])]
+    return sum(
+        not any(np.may_share_memory(np.asarray(after.iloc[:, i].array), buffer) for buffer in buffers)
+        for i in range(after.shape[1])
+    )
+
+
+def _safely(func, *args):
+    """Measurements must never break the stage they measure, failures are recorded as None"""
+    try:
+        return func(*args)
+    except Exception:
+        return None
+
+
+class Stage:
+    """Context manager measuring a block that turns `df` into `self.result`
+
+        with Stage('dedupe', df) as stage:
+            stage.result = df.drop_duplicates()
+    """
+
+    def __init__(self, name, df, recorder=recorder):
+        self.name = name
+        self.df = df
+        self.recorder = recorder
+        self.result = None
+        self._start = None
+
+    def __enter__(self):
+        if self.recorder.enabled:
+            self._memory_in = _safely(_memory, self.df)
+            self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if self._start is None or exc_type is not None:
+            return
+        duration = time.perf_counter_ns() - self._start
+        memory_out = _safely(_memory, self.result)
+        self.recorder.records.append(StageRecord(
+            stage=self.name,
+            start_ns=self._start,
+            duration_ns=duration,
+            rows_in=_safely(_rows, self.df),
+            rows_out=_safely(_rows, self.result),
+            memory_delta=None if None in (memory_out, self._memory_in) else memory_out - self._memory_in,
+            copies=_safely(_copies, self.df, self.result),
+        ))
+
+
+def instrument(func=None, *, name=None, recorder=recorder):
+    """Decorator recording a `.pipe` stage, use as `@instrument` or `@instrument(name=...)`"""
+    if func is None:
+        return functools.partial(instrument, name=name, recorder=recorder)
+
+    stage_name = name or func.__name__
+
+    @functools.wraps(func)
+    def wrapper(df, *args, **kwargs):
+        if not recorder.enabled:
+            return func(df, *args, **kwargs)
+        with Stage(stage_name, df, recorder) as stage:
+            stage.result = func(df, *args, **kwargs)
+        return stage.result
+
+    return wrapper
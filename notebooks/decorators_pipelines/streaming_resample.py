@@ -0,0 +1,86 @@
+import math
+from collections import deque
+
+import pandas as pd
+
+from copy_free_pipeline import parse_dates, rename_columns
+
+# How to merge the per-chunk partial aggregates of each function
+MERGE_PARTIALS = {'count': 'sum', 'sum': 'sum', 'min': 'min', 'max': 'max'}
+
+
+def stream_resample(path, start='2004', end='2014', sample_by='ME', col='category',
+                    agg_func='count', chunksize=100_000):
+    """`resample(sample_by)[[col]].agg(agg_func)` over a CSV that is read in chunks
+
+    Only one chunk and one partial aggregate per period are kept in memory. `sample_by`
+    needs bins that do not depend on where a chunk starts, like 'ME', 'W' or 'D'.
+    Only aggregations that can be merged from per-chunk partials are supported.
+    """
+    if agg_func not in MERGE_PARTIALS and agg_func != 'mean':
+        raise ValueError(
+            f"Cannot merge '{agg_func}' across chunks, use one of {[*MERGE_PARTIALS, 'mean']}"
+        )
+
+    header = pd.read_csv(path, nrows=0)
+    renamed = header.pipe(rename_columns).columns
+    usecols = [raw for raw, new in zip(header.columns, renamed) if new in ('date', col)]
+
+    lower = pd.Period(start).start_time
+    upper = (pd.Period(end) + 1).start_time
+    partial_funcs = ['sum', 'count'] if agg_func == 'mean' else [agg_func]
+
+    totals = None
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunksize):
+        chunk = chunk.pipe(rename_columns).pipe(parse_dates)
+        chunk = chunk.loc[(chunk['date'] >= lower) & (chunk['date'] < upper)]
+        if chunk.empty:
+            continue
+        partial = chunk.groupby(pd.Grouper(key='date', freq=sample_by))[col].agg(partial_funcs)
+        totals = partial if totals is None else _merge(totals, partial)
+
+    if totals is None:
+        return pd.DataFrame({col: []}, index=pd.DatetimeIndex([], name='date'))
+
+    bins = pd.date_range(totals.index.min(), totals.index.max(), freq=sample_by, name='date')
+    if agg_func == 'mean':
+        totals = totals.reindex(bins, fill_value=0)
+        values = totals['sum'] / totals['count'].where(totals['count'] > 0)
+    elif agg_func in ('count', 'sum'):
+        values = totals[agg_func].reindex(bins, fill_value=0)
+    else:
+        values = totals[agg_func].reindex(bins)
+    return values.rename(col).to_frame()
+
+
+def _merge(totals, partial):
+    merged = pd.concat([totals, partial]).groupby(level=0)
+    return merged.agg({name: MERGE_PARTIALS[name] for name in totals.columns})
+
+
+def rolling_window(values, window=10, agg_func='mean'):
+    """Yield `Series.rolling(window).agg(agg_func)` one value at a time
+
+    Like pandas, a window with fewer than `window` non-missing values gives NaN.
+    """
+    funcs = {'mean': lambda w: math.fsum(w) / len(w), 'sum': math.fsum, 'min': min, 'max': max}
+    if agg_func not in funcs:
+        raise ValueError(f"Unsupported rolling aggregation '{agg_func}', use one of {list(funcs)}")
+    return _rolling(values, window, funcs[agg_func])
+
+
+def _rolling(values, window, func):
+    current = deque(maxlen=window)
+    for value in values:
+        current.append(value)
+        if len(current) < window or any(math.isnan(v) for v in current):
+            yield math.nan
+        else:
+            yield func(current)
+
+
+def crime_counts(path, start='2004', end='2014', sample_by='ME', window=10,
+                 col='category', chunksize=100_000):
+    """The crime count pipeline with memory bounded by the number of periods"""
+    counts = stream_resample(path, start, end, sample_by, col, 'count', chunksize)
+    return counts.assign(rolling=list(rolling_window(counts[col].astype(float), window)))
@@ -0,0 +1,56 @@
+"""Compare peak memory of the in-memory and the chunked crime count pipeline
+
+    python streaming_resample_benchmark.py --rows 250000 1000000 4000000
+
+The in-memory peak grows with the number of rows, the chunked one with the chunk size.
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+import copy_free_pipeline
+import streaming_resample
+from copy_free_benchmark import make_scaled_csv
+
+
+def measure(func, *args, **kwargs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak / 2**20
+
+
+def in_memory(path):
+    return copy_free_pipeline.crime_counts(pd.read_csv(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[250_000, 1_000_000, 2_000_000])
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'mode':>10} {'seconds':>8} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = Path(tmp) / f'san_fran_crime_{rows}.csv'
+            make_scaled_csv(path, rows)
+
+            expected, seconds, peak = measure(in_memory, path)
+            print(f'{rows:>12,} {"in-memory":>10} {seconds:>8.2f} {peak:>8.1f}')
+
+            result, seconds, peak = measure(streaming_resample.crime_counts, path, chunksize=args.chunksize)
+            print(f'{rows:>12,} {"chunked":>10} {seconds:>8.2f} {peak:>8.1f}')
+
+            pd.testing.assert_frame_equal(expected, result)
+
+
+if __name__ == '__main__':
+    main()